@@ -0,0 +1,71 @@
+"""Shared fixtures: clients wired to an in-process ``httpx.MockTransport``."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import httpx
+import pytest
+import tinyhumansai as api
+from tinyhumansai import async_client, client, llm
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry immediately so retry tests do not sleep."""
+    monkeypatch.setattr(client, "_retry_delay", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(async_client, "_retry_delay", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(llm, "_llm_retry_delay", lambda *args, **kwargs: 0)
+
+
+@pytest.fixture
+def make_client() -> Any:
+    """Build a `TinyHumanMemoryClient` whose requests go to ``handler``."""
+    clients: list[api.TinyHumanMemoryClient] = []
+
+    def make(handler: Handler, **kwargs: Any) -> api.TinyHumanMemoryClient:
+        c = api.TinyHumanMemoryClient(
+            "test-token",
+            "test-model",
+            "https://api.test",
+            _transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+        clients.append(c)
+        return c
+
+    yield make
+    for c in clients:
+        c.close()
+
+
+@pytest.fixture
+def make_async_client() -> Any:
+    """Build an `AsyncTinyHumanMemoryClient` whose requests go to ``handler``.
+
+    Use the client with ``async with`` so it is closed on the test's loop.
+    """
+
+    def make(handler: Handler, **kwargs: Any) -> api.AsyncTinyHumanMemoryClient:
+        return api.AsyncTinyHumanMemoryClient(
+            "test-token",
+            "test-model",
+            "https://api.test",
+            _transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.fixture
+def llm_transport(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Route the shared sync LLM client to ``handler``."""
+
+    def install(handler: Handler) -> None:
+        mock = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm, "_client", mock)
+
+    return install
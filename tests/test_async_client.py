@@ -0,0 +1,54 @@
+"""Tests for `AsyncTinyHumanMemoryClient` request handling."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+import tinyhumansai as api
+
+ITEM = {"key": "k", "content": "c", "namespace": "ns", "metadata": {"tag": "a"}}
+
+
+def ok(data: dict) -> httpx.Response:
+    return httpx.Response(200, json={"success": True, "data": data})
+
+
+@pytest.mark.asyncio
+async def test_coalesce_shares_one_request_between_concurrent_reads(
+    make_async_client,
+) -> None:
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return ok({"items": [ITEM]})
+
+    async with make_async_client(handler, coalesce=True) as client:
+        results = await asyncio.gather(
+            *(client.recall_memory(namespace="ns", prompt="p") for _ in range(5))
+        )
+
+    assert len(calls) == 1
+    assert len({id(r.items[0].metadata) for r in results}) == 5
+
+
+@pytest.mark.asyncio
+async def test_read_is_retried_on_503_but_post_is_not(make_async_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1 or request.method == "POST":
+            return httpx.Response(503, json={"success": False, "error": "busy"})
+        return ok({"items": [ITEM]})
+
+    async with make_async_client(handler) as client:
+        result = await client.recall_memory(namespace="ns", prompt="p")
+        with pytest.raises(api.TinyHumanError):
+            await client.ingest_memory(item=ITEM)
+
+    assert result.count == 1
+    assert calls == ["GET", "GET", "POST"]
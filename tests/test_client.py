@@ -0,0 +1,297 @@
+"""Tests for `TinyHumanMemoryClient` request handling."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+import tinyhumansai as api
+
+ITEM = {"key": "k", "content": "c", "namespace": "ns"}
+
+
+def ok(data: dict) -> httpx.Response:
+    return httpx.Response(200, json={"success": True, "data": data})
+
+
+def _items(request: httpx.Request) -> list[dict]:
+    return json.loads(request.content)["items"]
+
+
+def test_auto_batch_sends_when_batch_size_is_reached(make_client) -> None:
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(_items(request))
+        return ok({"ingested": 2, "updated": 1, "errors": 0})
+
+    client = make_client(handler, auto_batch=True, batch_size=3, flush_ms=60_000)
+    with ThreadPoolExecutor(3) as pool:
+        results = list(
+            pool.map(
+                lambda i: client.ingest_memory(item={**ITEM, "key": f"k{i}"}),
+                range(3),
+            )
+        )
+
+    assert len(sent) == 1
+    assert sorted(item["key"] for item in sent[0]) == ["k0", "k1", "k2"]
+    assert sum(r.ingested for r in results) == 2
+    assert sum(r.updated for r in results) == 1
+    assert sum(r.errors for r in results) == 0
+
+
+def test_auto_batch_sends_after_flush_ms(make_client) -> None:
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(_items(request))
+        return ok({"ingested": 1, "updated": 0, "errors": 0})
+
+    client = make_client(handler, auto_batch=True, batch_size=64, flush_ms=10)
+    result = client.ingest_memory(item=ITEM)
+
+    assert sent == [[{**ITEM, "metadata": {}}]]
+    assert result == api.IngestMemoryResponse(ingested=1, updated=0, errors=0)
+
+
+def test_auto_batch_error_reaches_every_caller(make_client) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400, json={"success": False, "error": "bad batch"})
+
+    client = make_client(handler, auto_batch=True, batch_size=2, flush_ms=60_000)
+    with ThreadPoolExecutor(2) as pool:
+        futures = [
+            pool.submit(client.ingest_memory, item={**ITEM, "key": f"k{i}"})
+            for i in range(2)
+        ]
+        for future in futures:
+            with pytest.raises(api.TinyHumanError, match="bad batch"):
+                future.result()
+
+
+def test_coalesce_shares_one_request_between_concurrent_reads(make_client) -> None:
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        started.set()
+        release.wait(5)
+        item = {**ITEM, "metadata": {"tag": "a"}}
+        return ok({"items": [item]})
+
+    client = make_client(handler, coalesce=True)
+    with ThreadPoolExecutor(5) as pool:
+        futures = [
+            pool.submit(client.recall_memory, namespace="ns", prompt="p")
+            for _ in range(5)
+        ]
+        # Let every caller join the in-flight request before it returns
+        started.wait(5)
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(r.items == results[0].items for r in results)
+    # Each caller owns its result, down to nested metadata
+    assert len({id(r.items[0].metadata) for r in results}) == 5
+
+
+def test_read_is_retried_on_503(make_client) -> None:
+    statuses = iter([503, 200])
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        status = next(statuses)
+        if status == 503:
+            return httpx.Response(503, json={"success": False, "error": "busy"})
+        return ok({"items": [ITEM]})
+
+    client = make_client(handler)
+    result = client.recall_memory(namespace="ns", prompt="p")
+
+    assert len(calls) == 2
+    assert result.count == 1
+
+
+def test_post_without_idempotency_key_is_not_retried(make_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, json={"success": False, "error": "busy"})
+
+    client = make_client(handler)
+    with pytest.raises(api.TinyHumanError) as excinfo:
+        client.ingest_memory(item=ITEM)
+
+    assert excinfo.value.status == 503
+    assert len(calls) == 1
+
+
+def test_post_with_idempotency_key_is_retried(make_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503, json={"success": False, "error": "busy"})
+        return ok({"ingested": 1, "updated": 0, "errors": 0})
+
+    client = make_client(handler)
+    result = client.ingest_memory(item=ITEM, idempotency_key="once")
+
+    assert len(calls) == 2
+    assert {r.headers["Idempotency-Key"] for r in calls} == {"once"}
+    assert result.ingested == 1
+
+
+def test_gzip_body_falls_back_to_plain_on_415(make_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.headers.get("Content-Encoding") == "gzip":
+            return httpx.Response(415)
+        return ok({"ingested": 1, "updated": 0, "errors": 0})
+
+    client = make_client(handler, compress_threshold=1)
+    client.ingest_memory(item=ITEM)
+    client.ingest_memory(item=ITEM)
+
+    first, plain, second = calls
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(first.content) == plain.content
+    assert "Content-Encoding" not in plain.headers
+    # The client stops compressing once the server has refused it
+    assert "Content-Encoding" not in second.headers
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda client: client.recall_memory(namespace="ns", prompt="p"),
+        lambda client: client.ingest_memory(item=ITEM),
+    ],
+    ids=["recall", "ingest"],
+)
+def test_no_content_reply_to_read_or_ingest_raises(make_client, call) -> None:
+    client = make_client(lambda request: httpx.Response(204))
+    with pytest.raises(api.TinyHumanError) as excinfo:
+        call(client)
+
+    assert excinfo.value.status == 204
+
+
+def test_no_content_reply_to_delete_counts_nothing(make_client) -> None:
+    client = make_client(lambda request: httpx.Response(204))
+    result = client.delete_memory(namespace="ns", key="k")
+
+    assert result == api.DeleteMemoryResponse(deleted=0)
+
+
+def test_read_is_retried_after_a_timeout(make_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return ok({"items": [ITEM]})
+
+    client = make_client(handler)
+    result = client.recall_memory(namespace="ns", prompt="p")
+
+    assert len(calls) == 2
+    assert result.count == 1
+
+
+def test_permanent_transport_error_is_not_retried(make_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.UnsupportedProtocol("bad scheme", request=request)
+
+    client = make_client(handler)
+    with pytest.raises(httpx.UnsupportedProtocol):
+        client.recall_memory(namespace="ns", prompt="p")
+
+    assert len(calls) == 1
+
+
+def test_delete_rejects_a_string_as_keys(make_client) -> None:
+    calls = []
+    client = make_client(lambda request: calls.append(request))
+
+    with pytest.raises(TypeError):
+        client.delete_memory(namespace="ns", keys="abc")
+
+    assert calls == []
+
+
+def test_recall_is_served_from_cache(make_client) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return ok({"items": [ITEM]})
+
+    client = make_client(handler, cache_enabled=True)
+    first = client.recall_memory(namespace="ns", prompt="p")
+    second = client.recall_memory(namespace="ns", prompt="p")
+
+    assert len(calls) == 1
+    assert second == first
+
+
+def test_recall_in_flight_during_a_write_is_not_cached(make_client) -> None:
+    gets = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return ok({"ingested": 1, "updated": 0, "errors": 0})
+        gets.append(request)
+        if len(gets) == 1:
+            started.set()
+            release.wait(5)
+        return ok({"items": [ITEM]})
+
+    client = make_client(handler, cache_enabled=True)
+    with ThreadPoolExecutor(1) as pool:
+        pending = pool.submit(client.recall_memory, namespace="ns", prompt="p")
+        started.wait(5)
+        client.ingest_memory(item=ITEM)
+        release.set()
+        pending.result()
+    client.recall_memory(namespace="ns", prompt="p")
+
+    # The recall that raced the ingest was not cached, so this one refetched
+    assert len(gets) == 2
+
+
+def test_shared_pool_client_refuses_requests_after_close() -> None:
+    with api.TinyHumanMemoryClient("test-token", "test-model", "https://api.test") as c:
+        pass
+
+    with pytest.raises(RuntimeError, match="closed"):
+        c.recall_memory(namespace="ns", prompt="p")
+
+
+def test_auto_batch_client_refuses_ingests_after_close(make_client) -> None:
+    client = make_client(lambda request: ok({}), auto_batch=True)
+    client.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        client.ingest_memory(item=ITEM)
@@ -0,0 +1,172 @@
+"""Tests for streamed LLM replies."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+import tinyhumansai as api
+from tinyhumansai.llm import arecall_with_llm_stream, recall_with_llm_stream
+
+
+def _sse(*events: object, done: bool = False) -> bytes:
+    lines = []
+    for event in events:
+        if isinstance(event, str):
+            lines.append(event)
+        else:
+            lines.append(f"data: {json.dumps(event)}")
+        lines.append("")
+    if done:
+        lines += ["data: [DONE]", ""]
+    return "\n".join(lines).encode()
+
+
+def _stream_response(body: bytes) -> httpx.Response:
+    return httpx.Response(
+        200, content=body, headers={"Content-Type": "text/event-stream"}
+    )
+
+
+def test_openai_stream(llm_transport) -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return _stream_response(
+            _sse(
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                {"choices": [{"delta": {"content": "Hel"}}]},
+                {"choices": [{"delta": {"content": "lo"}}]},
+                {"choices": []},
+                done=True,
+            )
+        )
+
+    llm_transport(handler)
+    chunks = list(
+        recall_with_llm_stream(
+            prompt="hi", provider="openai", model="gpt-4o-mini", api_key="key"
+        )
+    )
+
+    assert chunks == ["Hel", "lo"]
+    assert json.loads(requests[0].content)["stream"] is True
+
+
+def test_anthropic_stream(llm_transport) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return _stream_response(
+            _sse(
+                "event: message_start",
+                {"type": "message_start", "message": {"id": "m"}},
+                ": keep-alive",
+                {"type": "content_block_start", "index": 0},
+                {
+                    "type": "content_block_delta",
+                    "delta": {"type": "text_delta", "text": "Hi "},
+                },
+                {
+                    "type": "content_block_delta",
+                    "delta": {"type": "text_delta", "text": "there"},
+                },
+                {"type": "message_stop"},
+            )
+        )
+
+    llm_transport(handler)
+    chunks = list(
+        recall_with_llm_stream(
+            prompt="hi", provider="anthropic", model="claude", api_key="key"
+        )
+    )
+
+    assert chunks == ["Hi ", "there"]
+
+
+def test_anthropic_stream_error_event(llm_transport) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return _stream_response(
+            _sse(
+                {
+                    "type": "content_block_delta",
+                    "delta": {"type": "text_delta", "text": "Hi"},
+                },
+                {
+                    "type": "error",
+                    "error": {"type": "overloaded_error", "message": "Overloaded"},
+                },
+            )
+        )
+
+    llm_transport(handler)
+    stream = recall_with_llm_stream(
+        prompt="hi", provider="anthropic", model="claude", api_key="key"
+    )
+
+    assert next(stream) == "Hi"
+    with pytest.raises(api.TinyHumanError, match="Overloaded"):
+        next(stream)
+
+
+def test_google_stream(llm_transport) -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return _stream_response(
+            _sse(
+                {"candidates": [{"content": {"parts": [{"text": "Gem"}]}}]},
+                {"candidates": [{"content": {"parts": [{"text": "ini"}]}}]},
+                {"usageMetadata": {"totalTokenCount": 3}},
+            )
+        )
+
+    llm_transport(handler)
+    chunks = list(
+        recall_with_llm_stream(
+            prompt="hi", provider="google", model="gemini-1.5-flash", api_key="key"
+        )
+    )
+
+    assert chunks == ["Gem", "ini"]
+    assert requests[0].url.params["alt"] == "sse"
+    assert requests[0].url.path.endswith(":streamGenerateContent")
+
+
+def test_stream_error_status_raises(llm_transport) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"error": {"message": "bad key"}})
+
+    llm_transport(handler)
+    with pytest.raises(api.TinyHumanError, match="bad key") as excinfo:
+        list(
+            recall_with_llm_stream(
+                prompt="hi", provider="openai", model="gpt-4o-mini", api_key="key"
+            )
+        )
+
+    assert excinfo.value.status == 401
+
+
+@pytest.mark.asyncio
+async def test_async_stream_uses_given_client() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return _stream_response(
+            _sse({"choices": [{"delta": {"content": "async"}}]}, done=True)
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        chunks = [
+            chunk
+            async for chunk in arecall_with_llm_stream(
+                prompt="hi",
+                provider="openai",
+                model="gpt-4o-mini",
+                api_key="key",
+                http_client=http,
+            )
+        ]
+
+    assert chunks == ["async"]
@@ -1,7 +1,11 @@
 """TinyHumans Python SDK."""
 
+from .async_client import AsyncTinyHumanMemoryClient
 from .client import TinyHumanMemoryClient
-from .llm import SUPPORTED_LLM_PROVIDERS
+from .llm import (
+    SUPPORTED_LLM_PROVIDERS,
+    warmup_llm_connections,
+)
 from .types import (
     TinyHumanError,
     DeleteMemoryResponse,
@@ -14,6 +18,7 @@ from .types import (
 
 __all__ = [
     "TinyHumanMemoryClient",
+    "AsyncTinyHumanMemoryClient",
     "TinyHumanError",
     "DeleteMemoryResponse",
     "IngestMemoryResponse",
@@ -22,4 +27,5 @@ __all__ = [
     "GetContextResponse",
     "ReadMemoryItem",
     "SUPPORTED_LLM_PROVIDERS",
+    "warmup_llm_connections",
 ]
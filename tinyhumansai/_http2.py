@@ -0,0 +1,12 @@
+"""Detection of the optional ``h2`` package that httpx needs for HTTP/2."""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+
+
+@functools.lru_cache(maxsize=None)
+def http2_available() -> bool:
+    """Return True if the optional ``h2`` package required for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
@@ -0,0 +1,43 @@
+"""Retry policy shared by the memory API clients and the LLM provider calls."""
+
+from __future__ import annotations
+
+import email.utils
+import random
+import time
+from typing import Optional
+
+import httpx
+
+# Retry policy for transient failures (rate limiting, gateway/server errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 30.0
+_RETRY_JITTER = 0.25
+
+
+def retry_delay(
+    attempt: int,
+    response: Optional[httpx.Response] = None,
+    max_delay: float = _RETRY_MAX_DELAY,
+) -> float:
+    """Seconds to wait before retry number ``attempt + 1``.
+
+    Honors a ``Retry-After`` header (delta-seconds or HTTP-date) when present,
+    otherwise uses exponential backoff with jitter. Either is capped at
+    ``max_delay``.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                retry_at = None
+            delay = retry_at.timestamp() - time.time() if retry_at is not None else -1
+        if delay >= 0:
+            return min(delay, max_delay)
+    backoff = min(max_delay, _RETRY_BASE_DELAY * 2**attempt)
+    return backoff + random.uniform(0, _RETRY_JITTER)
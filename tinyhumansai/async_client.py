@@ -0,0 +1,522 @@
+"""Asyncio variant of the TinyHumans memory client."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import gzip
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import httpx
+
+from ._http2 import http2_available as _http2_available
+from ._json import dumps as _json_dumps
+from .client import (
+    _CONNECT_ERRORS,
+    _CONNECT_RETRIES,
+    _GZIP_LEVEL,
+    _MEMORY_PATH,
+    _RETRY_STATUSES,
+    _TRANSIENT_ERRORS,
+    _BaseMemoryClient,
+    _auth_headers,
+    _body_headers,
+    _chunk_items,
+    _delete_body,
+    _ingest_response,
+    _normalize_items,
+    _parse_response,
+    _recall_params,
+    _recall_response,
+    _retry_delay,
+    _sum_ingest_responses,
+)
+from .llm import (
+    SUPPORTED_LLM_PROVIDERS,
+    _new_async_client,
+    arecall_with_llm as _query_llm_func,
+    arecall_with_llm_stream as _stream_llm_func,
+    awarmup_llm_connections as _warmup_llm_func,
+)
+from .types import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE,
+    DeleteMemoryResponse,
+    GetContextResponse,
+    IngestMemoryResponse,
+    LLMQueryResponse,
+    MemoryItem,
+)
+
+
+class AsyncTinyHumanMemoryClient(_BaseMemoryClient):
+    """Asynchronous client for the TinyHumans memory API.
+
+    Mirrors `TinyHumanMemoryClient` with ``async`` methods, so many ingests
+    and recalls can run concurrently with ``asyncio.gather``.
+
+    Args:
+        token: API token.
+        model_id: Model identifier sent with every request.
+        base_url: Optional API base URL override.
+        max_connections: Maximum number of concurrent connections in the pool.
+        max_keepalive: Maximum number of idle keep-alive connections to retain.
+        keepalive_expiry: Seconds an idle keep-alive connection is kept open.
+        http2: Negotiate HTTP/2 so concurrent requests share one connection.
+            Only takes effect when the ``h2`` package is installed
+            (``pip install "tinyhumansai[http2]"``); otherwise HTTP/1.1 is used.
+        coalesce: Share a single in-flight request between concurrent callers
+            issuing identical reads or key deletes (``delete_all`` is never
+            coalesced). Off by default; only enable it when every caller may
+            see the same response.
+        cache_enabled: Cache ``recall_memory`` results in memory. Entries are
+            dropped after ``cache_ttl`` seconds and whenever the namespace is
+            written through this client (ingest or delete).
+        cache_ttl: Seconds a cached recall stays valid (default 60).
+        cache_max: Maximum number of cached recalls (default 500).
+        compress_threshold: Gzip request bodies of at least this many bytes
+            (``Content-Encoding: gzip``). Disabled when None (default). If the
+            server rejects compressed bodies with 415, the request is resent
+            uncompressed and compression is turned off for this client.
+        max_retries: Times to retry a request after a network error or a 429/5xx
+            response, with exponential backoff (default 3). GET and DELETE are
+            always retried; ingest requests only when an ``idempotency_key`` is
+            given. Set to 0 to disable retries.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        model_id: str,
+        base_url: Optional[str] = None,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = True,
+        coalesce: bool = False,
+        cache_enabled: bool = False,
+        cache_ttl: float = 60,
+        cache_max: int = 500,
+        compress_threshold: Optional[int] = None,
+        max_retries: int = 3,
+        _transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        super().__init__(
+            token,
+            model_id,
+            base_url,
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+            coalesce=coalesce,
+            cache_enabled=cache_enabled,
+            cache_ttl=cache_ttl,
+            cache_max=cache_max,
+            compress_threshold=compress_threshold,
+            max_retries=max_retries,
+        )
+        self._inflight: dict[tuple[Any, ...], asyncio.Future[dict[str, Any]]] = {}
+        # Async connection pools are bound to the event loop that opened them,
+        # so each client owns its transport instead of using the shared pool.
+        # ``_transport`` replaces it, e.g. with a mock in tests.
+        if _transport is None:
+            _transport = httpx.AsyncHTTPTransport(
+                http2=http2 and _http2_available(),
+                limits=self._limits,
+                retries=_CONNECT_RETRIES,
+            )
+        self._http = httpx.AsyncClient(
+            base_url=self._base_url,
+            headers=_auth_headers(self._token, self._model_id),
+            timeout=30,
+            transport=_transport,
+        )
+        self._request_raw = self._http.request
+        # Pool for LLM provider requests, opened on first use
+        self._llm_http: Optional[httpx.AsyncClient] = None
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP clients and release connections."""
+        await self._http.aclose()
+        if self._llm_http is not None:
+            await self._llm_http.aclose()
+            self._llm_http = None
+
+    async def __aenter__(self) -> "AsyncTinyHumanMemoryClient":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    async def ingest_memory(
+        self,
+        *,
+        item: Union[MemoryItem, dict[str, Any]],
+        idempotency_key: Optional[str] = None,
+    ) -> IngestMemoryResponse:
+        """Ingest (upsert) a single memory item.
+
+        See `TinyHumanMemoryClient.ingest_memory`.
+
+        Raises:
+            TinyHumanError: On API errors.
+        """
+        return await self.ingest_memories(items=[item], idempotency_key=idempotency_key)
+
+    async def ingest_memories(
+        self,
+        *,
+        items: Sequence[Union[MemoryItem, dict[str, Any]]],
+        idempotency_key: Optional[str] = None,
+    ) -> IngestMemoryResponse:
+        """Ingest (upsert) one or more memory items.
+
+        See `TinyHumanMemoryClient.ingest_memories`.
+
+        Raises:
+            ValueError: If items list is empty.
+            TinyHumanError: On API errors.
+        """
+        if not items:
+            raise ValueError("items must be a non-empty list")
+
+        normalized = _normalize_items(items)
+        return await self._ingest_wire(normalized, idempotency_key)
+
+    async def ingest_memories_batched(
+        self,
+        *,
+        items: Sequence[Union[MemoryItem, dict[str, Any]]],
+        chunk_size: int = 500,
+        max_in_flight: int = 8,
+        idempotency_key: Optional[str] = None,
+    ) -> IngestMemoryResponse:
+        """Ingest (upsert) a large list of memory items as concurrent chunks.
+
+        See `TinyHumanMemoryClient.ingest_memories_batched`.
+
+        Raises:
+            ValueError: If items is empty or chunk_size/max_in_flight is not positive.
+            TinyHumanError: On API errors. Chunks that already succeeded are kept.
+        """
+        chunks = _chunk_items(items, chunk_size, max_in_flight)
+        if len(chunks) == 1:
+            return await self.ingest_memories(
+                items=chunks[0], idempotency_key=idempotency_key
+            )
+
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def send_chunk(index: int) -> IngestMemoryResponse:
+            chunk_key = None
+            if idempotency_key is not None:
+                chunk_key = f"{idempotency_key}:{index}"
+            async with semaphore:
+                return await self.ingest_memories(
+                    items=chunks[index], idempotency_key=chunk_key
+                )
+
+        results = await asyncio.gather(*(send_chunk(i) for i in range(len(chunks))))
+        return _sum_ingest_responses(results)
+
+    async def recall_memory(
+        self,
+        *,
+        namespace: str,
+        prompt: str,
+        num_chunks: int = 10,
+        key: Optional[str] = None,
+        keys: Optional[Sequence[str]] = None,
+    ) -> GetContextResponse:
+        """Get an LLM-friendly context string from stored memory.
+
+        See `TinyHumanMemoryClient.recall_memory`.
+
+        Raises:
+            ValueError: If num_chunks is not positive.
+            TinyHumanError: On API errors.
+        """
+        if num_chunks < 1:
+            raise ValueError("num_chunks must be >= 1")
+        cache_key = (namespace, prompt, num_chunks, key, tuple(keys or ()))
+        cached = self._cached_recall(cache_key)
+        if cached is not None:
+            return cached
+        generation = self._cache_generation(namespace)
+        params = _recall_params(namespace, prompt, num_chunks, key, keys)
+        data = await self._request("GET", _MEMORY_PATH, params=params)
+        result = _recall_response(data, num_chunks)
+        self._store_recall(cache_key, result, generation)
+        return result
+
+    async def delete_memory(
+        self,
+        *,
+        namespace: str,
+        key: Optional[str] = None,
+        keys: Optional[Sequence[str]] = None,
+        delete_all: bool = False,
+    ) -> DeleteMemoryResponse:
+        """Delete memory items by key, keys, or delete all.
+
+        See `TinyHumanMemoryClient.delete_memory`.
+
+        Raises:
+            ValueError: If no deletion target is specified.
+            TypeError: If keys is a string instead of a list of keys.
+            TinyHumanError: On API errors.
+        """
+        body = _delete_body(namespace, key, keys, delete_all)
+
+        try:
+            if self._coalesce and not delete_all:
+                data = await self._coalesced(
+                    ("DELETE", namespace, key, tuple(sorted(keys or ()))),
+                    lambda: self._request("DELETE", _MEMORY_PATH, body=body),
+                )
+            else:
+                data = await self._request("DELETE", _MEMORY_PATH, body=body)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(namespace)
+        # A 204 No Content reply carries no count
+        return DeleteMemoryResponse(deleted=data.get("deleted", 0))
+
+    async def recall_with_llm(
+        self,
+        *,
+        prompt: str,
+        provider: str = "openai",
+        model: str = "gpt-4o-mini",
+        api_key: str,
+        context: str = "",
+        namespace: Optional[str] = None,
+        num_chunks: int = 10,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        url: Optional[str] = None,
+        cache_context: bool = False,
+        cache_response: bool = False,
+    ) -> LLMQueryResponse:
+        """Optional: run a prompt through a supported LLM with optional context.
+
+        See `TinyHumanMemoryClient.recall_with_llm`.
+
+        Raises:
+            ValueError: If context is not provided and namespace is not provided; or provider/api_key invalid.
+            TinyHumanError: On provider API errors.
+        """
+        context = await self._llm_context(
+            prompt=prompt, context=context, namespace=namespace, num_chunks=num_chunks
+        )
+        return await _query_llm_func(
+            prompt=prompt,
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            context=context,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            url=url,
+            cache_context=cache_context,
+            cache_response=cache_response,
+            http_client=self._llm_client(),
+        )
+
+    async def recall_with_llm_stream(
+        self,
+        *,
+        prompt: str,
+        provider: str = "openai",
+        model: str = "gpt-4o-mini",
+        api_key: str,
+        context: str = "",
+        namespace: Optional[str] = None,
+        num_chunks: int = 10,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        url: Optional[str] = None,
+        cache_context: bool = False,
+    ) -> AsyncIterator[str]:
+        """Like `recall_with_llm`, but yields the reply text as it is generated.
+
+        See `TinyHumanMemoryClient.recall_with_llm_stream`. Iterate the result
+        with ``async for``; context is fetched on the first iteration.
+
+        Raises:
+            ValueError: If context is not provided and namespace is not provided; or provider/api_key invalid.
+            TinyHumanError: On API errors.
+        """
+        context = await self._llm_context(
+            prompt=prompt, context=context, namespace=namespace, num_chunks=num_chunks
+        )
+        async for chunk in _stream_llm_func(
+            prompt=prompt,
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            context=context,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            url=url,
+            cache_context=cache_context,
+            http_client=self._llm_client(),
+        ):
+            yield chunk
+
+    async def warmup_llm_connections(
+        self, providers: Iterable[str] = SUPPORTED_LLM_PROVIDERS
+    ) -> None:
+        """Open pooled connections to LLM providers ahead of the first request.
+
+        See `tinyhumansai.warmup_llm_connections`. Warms the pool used by this
+        client's `recall_with_llm`.
+
+        Args:
+            providers: Built-in provider names to connect to (default: all).
+
+        Raises:
+            ValueError: If a provider name is not supported.
+        """
+        await _warmup_llm_func(self._llm_client(), providers)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _ingest_wire(
+        self, normalized: list[dict[str, Any]], idempotency_key: Optional[str] = None
+    ) -> IngestMemoryResponse:
+        """POST already-normalized items and drop their namespaces from the cache."""
+        body = {"items": normalized}
+        try:
+            data = await self._request(
+                "POST", _MEMORY_PATH, body=body, idempotency_key=idempotency_key
+            )
+        finally:
+            self._invalidate_ingested(normalized)
+        return _ingest_response(data)
+
+    def _llm_client(self) -> httpx.AsyncClient:
+        if self._llm_http is None:
+            self._llm_http = _new_async_client()
+        return self._llm_http
+
+    async def _llm_context(
+        self, *, prompt: str, context: str, namespace: Optional[str], num_chunks: int
+    ) -> str:
+        """Return ``context``, or fetch it from memory when it is empty."""
+        if context.strip():
+            return context
+        if not namespace:
+            raise ValueError(
+                "When context is not provided, pass namespace (and optionally num_chunks) "
+                "so context can be fetched from memory via recall_memory."
+            )
+        ctx = await self.recall_memory(
+            namespace=namespace,
+            prompt=prompt,
+            num_chunks=num_chunks,
+        )
+        return ctx.context
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Sequence[tuple[str, str]]] = None,
+        body: Optional[dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> dict[str, Any]:
+        if body is None:
+            url, query = self._query_url(path, params)
+            if self._coalesce and method == "GET":
+                return await self._coalesced(
+                    (method, path, query), lambda: self._get(method, url)
+                )
+            return await self._get(method, url)
+
+        url = self._url(path)
+        content = _json_dumps(body)
+        # POST is only safe to replay when the server can deduplicate it
+        retry = method != "POST" or idempotency_key is not None
+        headers, gzip_headers = _body_headers(idempotency_key)
+        threshold = self._compress_threshold
+        if threshold is not None and len(content) >= threshold:
+            response = await self._request_with_retry(
+                method,
+                url,
+                retry=retry,
+                content=gzip.compress(content, compresslevel=_GZIP_LEVEL),
+                headers=gzip_headers,
+            )
+            if response.status_code != 415:
+                return _parse_response(response)
+            # Server does not accept compressed bodies; stop compressing.
+            self._compress_threshold = None
+        response = await self._request_with_retry(
+            method,
+            url,
+            retry=retry,
+            content=content,
+            headers=headers,
+        )
+        return _parse_response(response)
+
+    async def _get(self, method: str, url: httpx.URL) -> dict[str, Any]:
+        return _parse_response(await self._request_with_retry(method, url, retry=True))
+
+    async def _request_with_retry(
+        self, method: str, url: httpx.URL, *, retry: bool, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures when ``retry`` is set.
+
+        Retries timeouts, dropped connections and 429/5xx responses. Connect
+        failures are not retried here; the transport already did.
+        """
+        attempt = 0
+        while True:
+            can_retry = retry and attempt < self._max_retries
+            try:
+                response = await self._request_raw(method, url, **kwargs)
+            except _CONNECT_ERRORS:
+                raise
+            except _TRANSIENT_ERRORS:
+                if not can_retry:
+                    raise
+                delay = _retry_delay(attempt)
+            else:
+                if not can_retry or response.status_code not in _RETRY_STATUSES:
+                    return response
+                delay = _retry_delay(attempt, response)
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _coalesced(
+        self, key: tuple[Any, ...], fetch: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Run ``fetch`` once for all concurrent callers sharing ``key``."""
+        task = self._inflight.get(key)
+        owner = task is None
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled does not cancel the others
+        result = await asyncio.shield(task)
+        # Each waiter gets its own copy so callers cannot see each other's
+        # changes to nested values such as metadata
+        return result if owner else copy.deepcopy(result)
@@ -2,17 +2,34 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
+import gzip
+import operator
 import os
+import threading
 import time
-from typing import Any, Optional, Sequence, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional, Sequence, Union
+from urllib.parse import urlencode
 
 import httpx
 
-from .llm import recall_with_llm as _query_llm_func
+from ._http2 import http2_available as _http2_available
+from ._json import dumps as _json_dumps, loads as _json_loads
+from ._retry import RETRY_STATUSES as _RETRY_STATUSES, retry_delay as _retry_delay
+from .llm import (
+    recall_with_llm as _query_llm_func,
+    recall_with_llm_stream as _stream_llm_func,
+)
 from .types import (
     TinyHumanError,
     BASE_URL_ENV,
     DEFAULT_BASE_URL,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE,
     DeleteMemoryResponse,
     GetContextResponse,
     IngestMemoryResponse,
@@ -21,20 +38,106 @@ from .types import (
     ReadMemoryItem,
 )
 
+_MEMORY_PATH = "/memory"
+
+# Pre-encoded so httpx does not re-encode them on every request
+_JSON_HEADERS = ((b"Content-Type", b"application/json"),)
+_GZIP_JSON_HEADERS = _JSON_HEADERS + ((b"Content-Encoding", b"gzip"),)
+# Mid-range gzip level: most of the size reduction of level 9 at a fraction
+# of the CPU time on multi-MB bodies
+_GZIP_LEVEL = 5
+
+_MEMORY_ITEM_FIELDS = operator.attrgetter(
+    "key", "content", "namespace", "metadata", "created_at", "updated_at"
+)
+
+# Connection-level retries done by the httpx transport itself; the errors it
+# already retried are not retried again by ``_request_with_retry``
+_CONNECT_RETRIES = 2
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+# Network failures worth retrying; anything else (unsupported scheme, invalid
+# request, proxy errors) fails the same way every time
+_TRANSIENT_ERRORS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+# Bytes of a non-JSON response body kept on the raised TinyHumanError
+_ERROR_BODY_LIMIT = 512
+
+# Timestamps more than ~100 years in the future are rejected
+_HUNDRED_YEARS_SECONDS = 100 * 365 * 24 * 60 * 60
+_NUMERIC_TYPES = (int, float)
+
+
+def _auth_headers(token: str, model_id: str) -> tuple[tuple[bytes, bytes], ...]:
+    """Return the encoded auth headers for a client's credentials."""
+    return (
+        (b"Authorization", f"Bearer {token}".encode()),
+        (b"X-Model-Id", model_id.encode()),
+    )
+
+
+_shared_transports: dict[tuple[Any, ...], httpx.HTTPTransport] = {}
+_shared_transports_lock = threading.Lock()
+
+
+def _new_transport(limits: httpx.Limits, http2: bool) -> httpx.HTTPTransport:
+    """Create a pooled transport that retries failed connection attempts.
 
-def _validate_timestamp(value: Optional[float], name: str) -> None:
+    Transport-level retries only cover connect errors, so they are safe for
+    every method and keep retries on the same pool instead of a new client.
+    """
+    return httpx.HTTPTransport(http2=http2, limits=limits, retries=_CONNECT_RETRIES)
+
+
+def _get_shared_transport(
+    base_url: str, limits: httpx.Limits, http2: bool
+) -> httpx.HTTPTransport:
+    """Return the process-wide transport (connection pool) for ``base_url``.
+
+    Clients with the same base URL and pool settings reuse one transport, so
+    warm TCP/TLS connections survive short-lived client instances. Auth
+    headers stay on each client's own ``httpx.Client``.
+    """
+    key = (
+        base_url,
+        limits.max_connections,
+        limits.max_keepalive_connections,
+        limits.keepalive_expiry,
+        http2,
+    )
+    with _shared_transports_lock:
+        transport = _shared_transports.get(key)
+        if transport is None:
+            transport = _new_transport(limits, http2)
+            _shared_transports[key] = transport
+        return transport
+
+
+@atexit.register
+def _close_shared_transports() -> None:
+    with _shared_transports_lock:
+        for transport in _shared_transports.values():
+            transport.close()
+        _shared_transports.clear()
+
+
+def _validate_timestamp(value: Optional[float], name: str, max_future: float) -> None:
     """Validate a Unix timestamp (seconds).
 
     Args:
         value: Timestamp to validate (None is allowed).
         name: Field name for error messages.
+        max_future: Latest accepted timestamp.
 
     Raises:
         ValueError: If timestamp is invalid.
     """
     if value is None:
         return
-    if not isinstance(value, (int, float)):
+    if not isinstance(value, _NUMERIC_TYPES):
         raise ValueError(
             f"{name} must be a number (Unix timestamp in seconds), got {type(value).__name__}"
         )
@@ -42,28 +145,32 @@ def _validate_timestamp(value: Optional[float], name: str) -> None:
         raise ValueError(
             f"{name} must be non-negative (Unix timestamp in seconds), got {value}"
         )
-    # Reject timestamps that are too far in the future (e.g., > 100 years from now)
-    max_future = time.time() + (100 * 365 * 24 * 60 * 60)
     if value > max_future:
         raise ValueError(
             f"{name} is too far in the future (max ~100 years), got {value}"
         )
 
 
+def _max_future_timestamp() -> float:
+    """Return the latest timestamp accepted by `_validate_timestamp`."""
+    return time.time() + _HUNDRED_YEARS_SECONDS
+
+
 def _validate_timestamps(
-    created_at: Optional[float], updated_at: Optional[float]
+    created_at: Optional[float], updated_at: Optional[float], max_future: float
 ) -> None:
     """Validate created_at and updated_at timestamps together.
 
     Args:
         created_at: Creation timestamp (None is allowed).
         updated_at: Update timestamp (None is allowed).
+        max_future: Latest accepted timestamp, see `_max_future_timestamp`.
 
     Raises:
         ValueError: If timestamps are invalid or inconsistent.
     """
-    _validate_timestamp(created_at, "created_at")
-    _validate_timestamp(updated_at, "updated_at")
+    _validate_timestamp(created_at, "created_at", max_future)
+    _validate_timestamp(updated_at, "updated_at", max_future)
     if created_at is not None and updated_at is not None:
         if updated_at < created_at:
             raise ValueError(
@@ -71,41 +178,619 @@ def _validate_timestamps(
             )
 
 
-class TinyHumanMemoryClient:
-    """Synchronous client for the TinyHumans memory API.
+def _wire_item(
+    key: str,
+    content: str,
+    namespace: str,
+    metadata: dict[str, Any],
+    created_at: Optional[float],
+    updated_at: Optional[float],
+) -> dict[str, Any]:
+    """Build the API representation of one memory item.
 
-    Args:
-        token: API token.
-        model_id: Model identifier sent with every request.
-        base_url: Optional API base URL override.
+    Timestamps are sent as camelCase ``createdAt``/``updatedAt`` and omitted
+    when unset.
+    """
+    wire: dict[str, Any] = {
+        "key": key,
+        "content": content,
+        "namespace": namespace,
+        "metadata": metadata,
+    }
+    if created_at is not None:
+        wire["createdAt"] = created_at
+    if updated_at is not None:
+        wire["updatedAt"] = updated_at
+    return wire
+
+
+def _memory_item_to_wire(item: MemoryItem, max_future: float) -> dict[str, Any]:
+    """Validate a `MemoryItem` and convert it to its API representation."""
+    fields = _MEMORY_ITEM_FIELDS(item)
+    _validate_timestamps(fields[4], fields[5], max_future)
+    return _wire_item(*fields)
+
+
+def _dict_item_to_wire(item: dict[str, Any], max_future: float) -> dict[str, Any]:
+    """Validate a dict memory item and convert it to its API representation."""
+    get = item.get
+    # Explicit None checks so an epoch (0) timestamp is not treated as missing
+    created_at = get("createdAt")
+    if created_at is None:
+        created_at = get("created_at")
+    updated_at = get("updatedAt")
+    if updated_at is None:
+        updated_at = get("updated_at")
+    _validate_timestamps(created_at, updated_at, max_future)
+    namespace = get("namespace")
+    if namespace is None and "namespace" not in item:
+        raise ValueError("items: each dict must include 'namespace'")
+    return _wire_item(
+        item["key"],
+        item["content"],
+        namespace,
+        get("metadata", {}),
+        created_at,
+        updated_at,
+    )
+
+
+# Exact-type dispatch for the common cases; subclasses fall back to isinstance
+_WIRE_CONVERTERS: dict[type, Callable[[Any, float], dict[str, Any]]] = {
+    dict: _dict_item_to_wire,
+    MemoryItem: _memory_item_to_wire,
+}
+
+
+def _item_to_wire(
+    item: Union[MemoryItem, dict[str, Any]], max_future: float
+) -> dict[str, Any]:
+    """Convert an ingest item (`MemoryItem` or dict) to its API representation."""
+    convert = _WIRE_CONVERTERS.get(type(item))
+    if convert is not None:
+        return convert(item, max_future)
+    if isinstance(item, dict):
+        return _dict_item_to_wire(item, max_future)
+    if isinstance(item, MemoryItem):
+        return _memory_item_to_wire(item, max_future)
+    raise TypeError("items must be MemoryItem or dict")
+
+
+def _normalize_items(
+    items: Sequence[Union[MemoryItem, dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Validate ingest items and convert them to their API representation."""
+    # Read the clock once for the whole batch rather than once per item
+    max_future = _max_future_timestamp()
+    return [_item_to_wire(item, max_future) for item in items]
+
+
+def _ingest_response(data: dict[str, Any]) -> IngestMemoryResponse:
+    return IngestMemoryResponse(
+        ingested=data["ingested"],
+        updated=data["updated"],
+        errors=data["errors"],
+    )
+
+
+def _sum_ingest_responses(
+    results: Sequence[IngestMemoryResponse],
+) -> IngestMemoryResponse:
+    return IngestMemoryResponse(
+        ingested=sum(r.ingested for r in results),
+        updated=sum(r.updated for r in results),
+        errors=sum(r.errors for r in results),
+    )
+
+
+def _chunk_items(
+    items: Sequence[Any], chunk_size: int, max_in_flight: int
+) -> list[Sequence[Any]]:
+    """Validate batched-ingest arguments and split ``items`` into chunks."""
+    if not items:
+        raise ValueError("items must be a non-empty list")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be >= 1")
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def _recall_params(
+    namespace: str,
+    prompt: str,
+    num_chunks: int,
+    key: Optional[str],
+    keys: Optional[Sequence[str]],
+) -> Sequence[tuple[str, str]]:
+    required = (
+        ("namespace", namespace),
+        ("prompt", prompt),
+        ("limit", str(num_chunks)),
+    )
+    # Common case: no key filters, so the fixed tuple is all that is needed
+    if not (key or keys):
+        return required
+    params = list(required)
+    if key:
+        params.append(("key", key))
+    if keys:
+        params.extend([("keys[]", k) for k in keys])
+    return params
+
+
+def _recall_response(data: dict[str, Any], num_chunks: int) -> GetContextResponse:
+    """Build the recall result, including the formatted context string."""
+    raw = data["items"]
+    # The server applies the limit; only trim if it returned more
+    if len(raw) > num_chunks:
+        raw = raw[:num_chunks]
+    items = [
+        ReadMemoryItem(
+            key=item["key"],
+            content=item["content"],
+            namespace=item["namespace"],
+            metadata=item.get("metadata", {}),
+            created_at=item.get("createdAt", ""),
+            updated_at=item.get("updatedAt", ""),
+        )
+        for item in raw
+    ]
+
+    context = "\n\n".join(f"[{it.namespace}:{it.key}]\n{it.content}" for it in items)
+
+    return GetContextResponse(context=context, items=items, count=len(items))
+
+
+def _delete_body(
+    namespace: str,
+    key: Optional[str],
+    keys: Optional[Sequence[str]],
+    delete_all: bool,
+) -> dict[str, Any]:
+    """Validate the deletion target and build the DELETE request body."""
+    # A bare string is a sequence too and would delete one key per character
+    if isinstance(keys, str):
+        raise TypeError("keys must be a list or tuple of keys, not a string")
+    # Empty strings and sequences are falsy, so this rejects them too
+    if not (key or keys or delete_all):
+        raise ValueError('Provide "key", "keys", or set delete_all=True')
+
+    body: dict[str, Any] = {"namespace": namespace}
+    if key is not None:
+        body["key"] = key
+    if keys is not None:
+        body["keys"] = list(keys)
+    if delete_all:
+        body["deleteAll"] = True
+    return body
+
+
+def _body_headers(
+    idempotency_key: Optional[str],
+) -> tuple[tuple[tuple[bytes, bytes], ...], tuple[tuple[bytes, bytes], ...]]:
+    """Return the plain and gzip headers for a JSON request body."""
+    if idempotency_key is None:
+        return _JSON_HEADERS, _GZIP_JSON_HEADERS
+    extra = ((b"Idempotency-Key", idempotency_key.encode()),)
+    return _JSON_HEADERS + extra, _GZIP_JSON_HEADERS + extra
+
+
+def _body_excerpt(response: httpx.Response) -> str:
+    """Decode at most the first ``_ERROR_BODY_LIMIT`` bytes of a response body."""
+    excerpt = response.content[:_ERROR_BODY_LIMIT]
+    return excerpt.decode(response.charset_encoding or "utf-8", errors="replace")
+
+
+def _parse_response(response: httpx.Response) -> dict[str, Any]:
+    """Return the ``data`` payload of an API response.
+
+    Raises:
+        TinyHumanError: On error statuses and on empty or non-JSON bodies
+            (other than a 204 No Content reply to a DELETE).
+    """
+    # Only deletes can do without a payload; reads and ingests need their data
+    if response.status_code == 204 and response.request.method == "DELETE":
+        return {}
+    if not response.content:
+        raise TinyHumanError(
+            f"HTTP {response.status_code}: non-JSON response",
+            response.status_code,
+            "",
+        )
+    content_type = response.headers.get("Content-Type")
+    # Skip parsing bodies the server labels as something else, such as HTML
+    # error pages from a proxy; a missing header still gets a parse attempt
+    if content_type is not None and "json" not in content_type:
+        raise TinyHumanError(
+            f"HTTP {response.status_code}: non-JSON response",
+            response.status_code,
+            _body_excerpt(response),
+        )
+    try:
+        payload = _json_loads(response.content)
+    except Exception:
+        raise TinyHumanError(
+            f"HTTP {response.status_code}: non-JSON response",
+            response.status_code,
+            _body_excerpt(response),
+        )
+    if not response.is_success:
+        message = payload.get("error", f"HTTP {response.status_code}")
+        raise TinyHumanError(message, response.status_code, payload)
+    return payload["data"]
+
+
+class _ResponseCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Keys are tuples whose first element is the namespace, so entries can be
+    invalidated per namespace. Each invalidation also bumps a generation, so a
+    result fetched before a write to its namespace is not stored after it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by ``invalidate()`` of everything / of one namespace
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+
+    def get(self, key: tuple[Any, ...]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def generation(self, namespace: str) -> tuple[int, int]:
+        """Return a token that changes whenever ``namespace`` is invalidated."""
+        with self._lock:
+            return self._epoch, self._generations.get(namespace, 0)
+
+    def set(
+        self,
+        key: tuple[Any, ...],
+        value: Any,
+        generation: Optional[tuple[int, int]] = None,
+    ) -> None:
+        """Store ``value`` unless its namespace changed since ``generation``."""
+        with self._lock:
+            if generation is not None and generation != (
+                self._epoch,
+                self._generations.get(key[0], 0),
+            ):
+                return
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._epoch += 1
+                self._entries.clear()
+                return
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+
+
+class _IngestBatcher:
+    """Coalesces single-item ingests from concurrent callers into one POST.
+
+    Items are buffered until ``batch_size`` are pending or ``flush_ms``
+    milliseconds have passed since the first one arrived, then sent together
+    with ``send``. Each caller gets a future resolved when its batch returns.
     """
 
+    def __init__(
+        self,
+        send: Callable[[list[dict[str, Any]]], IngestMemoryResponse],
+        batch_size: int,
+        flush_ms: float,
+    ) -> None:
+        self._send = send
+        self._batch_size = batch_size
+        self._delay = flush_ms / 1000
+        self._lock = threading.Lock()
+        self._buffer: list[tuple[dict[str, Any], Future[IngestMemoryResponse]]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, wire: dict[str, Any]) -> Future[IngestMemoryResponse]:
+        future: Future[IngestMemoryResponse] = Future()
+        batch = None
+        with self._lock:
+            self._buffer.append((wire, future))
+            if len(self._buffer) >= self._batch_size:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._send_batch(batch)
+        return future
+
+    def flush(self) -> None:
+        """Send everything buffered so far."""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send_batch(batch)
+
+    def _take(self) -> list[tuple[dict[str, Any], Future[IngestMemoryResponse]]]:
+        batch, self._buffer = self._buffer, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _send_batch(
+        self, batch: list[tuple[dict[str, Any], Future[IngestMemoryResponse]]]
+    ) -> None:
+        try:
+            result = self._send([wire for wire, _ in batch])
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        # The API only returns totals, so attribute them to items in order:
+        # the first ``ingested`` items were ingested, the next ``updated``
+        # were updated and the rest errored.
+        ingested, updated = result.ingested, result.updated
+        for index, (_, future) in enumerate(batch):
+            future.set_result(
+                IngestMemoryResponse(
+                    ingested=int(index < ingested),
+                    updated=int(ingested <= index < ingested + updated),
+                    errors=int(index >= ingested + updated),
+                )
+            )
+
+
+class _BaseMemoryClient:
+    """Configuration and request helpers shared by the sync and async clients."""
+
     def __init__(
         self,
         token: str,
         model_id: str,
-        base_url: Optional[str] = None,
+        base_url: Optional[str],
+        *,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_expiry: float,
+        coalesce: bool,
+        cache_enabled: bool,
+        cache_ttl: float,
+        cache_max: int,
+        compress_threshold: Optional[int],
+        max_retries: int,
     ) -> None:
-        if not token or not token.strip():
+        token = (token or "").strip()
+        if not token:
             raise ValueError("token is required")
-        if not model_id or not model_id.strip():
+        model_id = (model_id or "").strip()
+        if not model_id:
             raise ValueError("model_id is required")
         resolved_base_url = base_url or os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL
         self._base_url = resolved_base_url.rstrip("/")
         self._token = token
         self._model_id = model_id
+        self._coalesce = coalesce
+        self._cache: Optional[_ResponseCache] = None
+        if cache_enabled:
+            if cache_ttl <= 0:
+                raise ValueError("cache_ttl must be > 0")
+            if cache_max < 1:
+                raise ValueError("cache_max must be >= 1")
+            self._cache = _ResponseCache(maxsize=cache_max, ttl=cache_ttl)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._urls: dict[str, httpx.URL] = {}
+        if compress_threshold is not None and compress_threshold < 0:
+            raise ValueError("compress_threshold must be >= 0")
+        self._compress_threshold = compress_threshold
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+        self._max_retries = max_retries
+
+    def invalidate_cache(self, namespace: Optional[str] = None) -> None:
+        """Drop cached ``recall_memory`` results.
+
+        Args:
+            namespace: Only drop entries for this namespace. Drops everything if None.
+        """
+        if self._cache is not None:
+            self._cache.invalidate(namespace)
+
+    def _cached_recall(
+        self, cache_key: tuple[Any, ...]
+    ) -> Optional[GetContextResponse]:
+        """Return a copy of a cached recall result, or None on a miss."""
+        if self._cache is None:
+            return None
+        cached = self._cache.get(cache_key)
+        return copy.deepcopy(cached) if cached is not None else None
+
+    def _cache_generation(self, namespace: str) -> Optional[tuple[int, int]]:
+        """Return the cache generation of ``namespace``, read before a recall."""
+        return self._cache.generation(namespace) if self._cache is not None else None
+
+    def _store_recall(
+        self,
+        cache_key: tuple[Any, ...],
+        result: GetContextResponse,
+        generation: Optional[tuple[int, int]],
+    ) -> None:
+        # Skipped if the namespace was written while the recall was in flight
+        if self._cache is not None:
+            self._cache.set(cache_key, copy.deepcopy(result), generation)
+
+    def _invalidate_ingested(self, normalized: list[dict[str, Any]]) -> None:
+        """Drop cached recalls for the namespaces of ingested wire items."""
+        if self._cache is not None:
+            for namespace in {it["namespace"] for it in normalized}:
+                self._cache.invalidate(namespace)
+
+    def _url(self, path: str) -> httpx.URL:
+        """Return the absolute URL for ``path``, parsed once and cached."""
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = httpx.URL(self._base_url + path)
+        return url
+
+    def _query_url(
+        self, path: str, params: Optional[Sequence[tuple[str, str]]]
+    ) -> tuple[httpx.URL, str]:
+        """Return the URL for ``path`` with ``params`` and the encoded query."""
+        url = self._url(path)
+        # Encode the whole query in one urlencode call instead of httpx's
+        # per-parameter QueryParams handling
+        query = urlencode(params) if params else ""
+        if query:
+            url = url.copy_with(query=query.encode("ascii"))
+        return url, query
+
+
+class TinyHumanMemoryClient(_BaseMemoryClient):
+    """Synchronous client for the TinyHumans memory API.
+
+    Args:
+        token: API token.
+        model_id: Model identifier sent with every request.
+        base_url: Optional API base URL override.
+        max_connections: Maximum number of concurrent connections in the pool.
+        max_keepalive: Maximum number of idle keep-alive connections to retain.
+        keepalive_expiry: Seconds an idle keep-alive connection is kept open.
+        http2: Negotiate HTTP/2 so concurrent requests share one connection.
+            Only takes effect when the ``h2`` package is installed
+            (``pip install "tinyhumansai[http2]"``); otherwise HTTP/1.1 is used.
+        coalesce: Share a single in-flight request between concurrent callers
+            issuing identical reads or key deletes (``delete_all`` is never
+            coalesced). Off by default; only enable it when every caller may
+            see the same response.
+        cache_enabled: Cache ``recall_memory`` results in memory. Entries are
+            dropped after ``cache_ttl`` seconds and whenever the namespace is
+            written through this client (ingest or delete).
+        cache_ttl: Seconds a cached recall stays valid (default 60).
+        cache_max: Maximum number of cached recalls (default 500).
+        use_shared_pool: Reuse a process-wide connection pool shared by all
+            clients with the same base URL and pool settings (default True),
+            so short-lived clients skip TCP/TLS setup. ``close()`` then leaves
+            the shared pool open for other clients. Pass False to give this
+            client its own pool, closed by ``close()``.
+        auto_batch: Buffer ``ingest_memory`` calls made without an
+            ``idempotency_key`` and send them together in one request, so
+            concurrent single-item ingests share a round trip. Each call still
+            blocks until its batch returns. Off by default.
+        batch_size: Send a buffered batch once it holds this many items
+            (default 64). Only used with ``auto_batch``.
+        flush_ms: Send a buffered batch this many milliseconds after its first
+            item arrived, even if it is not full (default 20). Only used with
+            ``auto_batch``.
+        compress_threshold: Gzip request bodies of at least this many bytes
+            (``Content-Encoding: gzip``). Disabled when None (default). If the
+            server rejects compressed bodies with 415, the request is resent
+            uncompressed and compression is turned off for this client.
+        max_retries: Times to retry a request after a network error or a 429/5xx
+            response, with exponential backoff (default 3). GET and DELETE are
+            always retried; ingest requests only when an ``idempotency_key`` is
+            given. Set to 0 to disable retries.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        model_id: str,
+        base_url: Optional[str] = None,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = True,
+        coalesce: bool = False,
+        cache_enabled: bool = False,
+        cache_ttl: float = 60,
+        cache_max: int = 500,
+        use_shared_pool: bool = True,
+        auto_batch: bool = False,
+        batch_size: int = 64,
+        flush_ms: float = 20,
+        compress_threshold: Optional[int] = None,
+        max_retries: int = 3,
+        _transport: Optional[httpx.BaseTransport] = None,
+    ) -> None:
+        super().__init__(
+            token,
+            model_id,
+            base_url,
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+            coalesce=coalesce,
+            cache_enabled=cache_enabled,
+            cache_ttl=cache_ttl,
+            cache_max=cache_max,
+            compress_threshold=compress_threshold,
+            max_retries=max_retries,
+        )
+        self._inflight: dict[tuple[Any, ...], Future[dict[str, Any]]] = {}
+        self._inflight_lock = threading.Lock()
+        use_http2 = http2 and _http2_available()
+        # ``_transport`` replaces the connection pool, e.g. with a mock in tests
+        self._owns_transport = _transport is not None or not use_shared_pool
+        self._closed = False
+        if _transport is None:
+            _transport = (
+                _get_shared_transport(self._base_url, self._limits, use_http2)
+                if use_shared_pool
+                else _new_transport(self._limits, use_http2)
+            )
+        self._batcher: Optional[_IngestBatcher] = None
+        if auto_batch:
+            if batch_size < 1:
+                raise ValueError("batch_size must be >= 1")
+            if flush_ms < 0:
+                raise ValueError("flush_ms must be >= 0")
+            self._batcher = _IngestBatcher(self._ingest_wire, batch_size, flush_ms)
         self._http = httpx.Client(
             base_url=self._base_url,
-            headers={
-                "Authorization": f"Bearer {self._token}",
-                "X-Model-Id": self._model_id,
-            },
+            headers=_auth_headers(self._token, self._model_id),
             timeout=30,
+            transport=_transport,
         )
+        # Bound once; the retry loop calls it for every request
+        self._request_raw = self._http.request
 
     def close(self) -> None:
-        """Close the underlying HTTP client and release connections."""
-        self._http.close()
+        """Close the client and release its connections.
+
+        Ingests buffered by ``auto_batch`` are sent first. Any later request
+        raises RuntimeError. Clients using the shared pool leave it open for
+        other clients; it is closed when the interpreter exits.
+        """
+        self.flush()
+        self._closed = True
+        if self._owns_transport:
+            self._http.close()
+
+    def flush(self) -> None:
+        """Send ingests buffered by ``auto_batch`` now instead of waiting."""
+        if self._batcher is not None:
+            self._batcher.flush()
 
     def __enter__(self) -> "TinyHumanMemoryClient":
         return self
@@ -117,6 +802,7 @@ class TinyHumanMemoryClient:
         self,
         *,
         item: Union[MemoryItem, dict[str, Any]],
+        idempotency_key: Optional[str] = None,
     ) -> IngestMemoryResponse:
         """Ingest (upsert) a single memory item.
 
@@ -127,6 +813,8 @@ class TinyHumanMemoryClient:
             item: A `MemoryItem` or a dict with keys: `key` (str), `content` (str),
                 `namespace` (str, required), optional `metadata` (dict),
                 optional `created_at` (float, Unix seconds), optional `updated_at` (float, Unix seconds).
+            idempotency_key: Optional key sent as the ``Idempotency-Key`` header.
+                When set, the request is retried on transient failures.
 
         Returns:
             Counts of ingested, updated, and errored items (ingested + updated <= 1).
@@ -134,12 +822,16 @@ class TinyHumanMemoryClient:
         Raises:
             TinyHumanError: On API errors.
         """
-        return self.ingest_memories(items=[item])
+        if self._batcher is not None and idempotency_key is None:
+            self._ensure_open()
+            return self._batcher.submit(_normalize_items([item])[0]).result()
+        return self.ingest_memories(items=[item], idempotency_key=idempotency_key)
 
     def ingest_memories(
         self,
         *,
         items: Sequence[Union[MemoryItem, dict[str, Any]]],
+        idempotency_key: Optional[str] = None,
     ) -> IngestMemoryResponse:
         """Ingest (upsert) one or more memory items.
 
@@ -152,6 +844,8 @@ class TinyHumanMemoryClient:
                 keys: `key` (str), `content` (str), `namespace` (str, required),
                 optional `metadata` (dict), optional `created_at` (float, Unix seconds),
                 optional `updated_at` (float, Unix seconds).
+            idempotency_key: Optional key sent as the ``Idempotency-Key`` header.
+                When set, the request is retried on transient failures.
 
         Returns:
             Counts of ingested, updated, and errored items.
@@ -163,48 +857,55 @@ class TinyHumanMemoryClient:
         if not items:
             raise ValueError("items must be a non-empty list")
 
-        normalized: list[dict[str, Any]] = []
-        for item in items:
-            if isinstance(item, MemoryItem):
-                _validate_timestamps(item.created_at, item.updated_at)
-                item_dict: dict[str, Any] = {
-                    "key": item.key,
-                    "content": item.content,
-                    "namespace": item.namespace,
-                    "metadata": item.metadata,
-                }
-                if item.created_at is not None:
-                    item_dict["createdAt"] = item.created_at
-                if item.updated_at is not None:
-                    item_dict["updatedAt"] = item.updated_at
-                normalized.append(item_dict)
-            elif isinstance(item, dict):
-                created_at = item.get("createdAt") or item.get("created_at")
-                updated_at = item.get("updatedAt") or item.get("updated_at")
-                _validate_timestamps(created_at, updated_at)
-                if "namespace" not in item:
-                    raise ValueError("items: each dict must include 'namespace'")
-                item_dict = {
-                    "key": item["key"],
-                    "content": item["content"],
-                    "namespace": item["namespace"],
-                    "metadata": item.get("metadata", {}),
-                }
-                if created_at is not None:
-                    item_dict["createdAt"] = created_at
-                if updated_at is not None:
-                    item_dict["updatedAt"] = updated_at
-                normalized.append(item_dict)
-            else:
-                raise TypeError("items must be MemoryItem or dict")
+        normalized = _normalize_items(items)
+        return self._ingest_wire(normalized, idempotency_key)
 
-        body = {"items": normalized}
-        data = self._send("POST", "/memory", body)
-        return IngestMemoryResponse(
-            ingested=data["ingested"],
-            updated=data["updated"],
-            errors=data["errors"],
-        )
+    def ingest_memories_batched(
+        self,
+        *,
+        items: Sequence[Union[MemoryItem, dict[str, Any]]],
+        chunk_size: int = 500,
+        max_in_flight: int = 8,
+        idempotency_key: Optional[str] = None,
+    ) -> IngestMemoryResponse:
+        """Ingest (upsert) a large list of memory items as concurrent chunks.
+
+        Items are split into chunks of ``chunk_size`` and each chunk is sent as
+        its own ``ingest_memories`` request, with up to ``max_in_flight``
+        requests running at once over the shared connection pool. Larger chunks
+        mean fewer round trips; smaller chunks keep each request short and let
+        more of them overlap.
+
+        Args:
+            items: Items to upsert, in the same forms accepted by `ingest_memories`.
+            chunk_size: Maximum number of items per request (default 500).
+            max_in_flight: Maximum number of concurrent requests (default 8).
+            idempotency_key: Optional base key; chunk ``i`` is sent with
+                ``Idempotency-Key: <idempotency_key>:<i>`` and retried on
+                transient failures.
+
+        Returns:
+            Counts of ingested, updated, and errored items summed over all chunks.
+
+        Raises:
+            ValueError: If items is empty or chunk_size/max_in_flight is not positive.
+            TinyHumanError: On API errors. Chunks that already succeeded are kept.
+        """
+        chunks = _chunk_items(items, chunk_size, max_in_flight)
+        if len(chunks) == 1:
+            return self.ingest_memories(
+                items=chunks[0], idempotency_key=idempotency_key
+            )
+
+        def send_chunk(index: int) -> IngestMemoryResponse:
+            chunk_key = None
+            if idempotency_key is not None:
+                chunk_key = f"{idempotency_key}:{index}"
+            return self.ingest_memories(items=chunks[index], idempotency_key=chunk_key)
+
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(chunks))) as pool:
+            results = list(pool.map(send_chunk, range(len(chunks))))
+        return _sum_ingest_responses(results)
 
     def recall_memory(
         self,
@@ -236,38 +937,16 @@ class TinyHumanMemoryClient:
         """
         if num_chunks < 1:
             raise ValueError("num_chunks must be >= 1")
-        params: list[tuple[str, str]] = [
-            ("namespace", namespace),
-            ("prompt", prompt),
-            ("limit", str(num_chunks)),
-        ]
-        if key:
-            params.append(("key", key))
-        if keys:
-            for k in keys:
-                params.append(("keys[]", k))
-
-        data = self._get("/memory", params)
-        items = [
-            ReadMemoryItem(
-                key=item["key"],
-                content=item["content"],
-                namespace=item["namespace"],
-                metadata=item.get("metadata", {}),
-                created_at=item.get("createdAt", ""),
-                updated_at=item.get("updatedAt", ""),
-            )
-            for item in data["items"]
-        ]
-        items = items[:num_chunks]
-
-        context_parts: list[str] = []
-        for it in items:
-            header = f"[{it.namespace}:{it.key}]"
-            context_parts.append(f"{header}\n{it.content}")
-        context = "\n\n".join(context_parts)
-
-        return GetContextResponse(context=context, items=items, count=len(items))
+        cache_key = (namespace, prompt, num_chunks, key, tuple(keys or ()))
+        cached = self._cached_recall(cache_key)
+        if cached is not None:
+            return cached
+        generation = self._cache_generation(namespace)
+        params = _recall_params(namespace, prompt, num_chunks, key, keys)
+        data = self._request("GET", _MEMORY_PATH, params=params)
+        result = _recall_response(data, num_chunks)
+        self._store_recall(cache_key, result, generation)
+        return result
 
     def delete_memory(
         self,
@@ -290,23 +969,24 @@ class TinyHumanMemoryClient:
 
         Raises:
             ValueError: If no deletion target is specified.
+            TypeError: If keys is a string instead of a list of keys.
             TinyHumanError: On API errors.
         """
-        has_key = isinstance(key, str) and len(key) > 0
-        has_keys = isinstance(keys, (list, tuple)) and len(keys) > 0
-        if not has_key and not has_keys and not delete_all:
-            raise ValueError('Provide "key", "keys", or set delete_all=True')
-
-        body: dict[str, Any] = {"namespace": namespace}
-        if key is not None:
-            body["key"] = key
-        if keys is not None:
-            body["keys"] = list(keys)
-        if delete_all:
-            body["deleteAll"] = True
-
-        data = self._send("DELETE", "/memory", body)
-        return DeleteMemoryResponse(deleted=data["deleted"])
+        body = _delete_body(namespace, key, keys, delete_all)
+
+        try:
+            if self._coalesce and not delete_all:
+                data = self._coalesced(
+                    ("DELETE", namespace, key, tuple(sorted(keys or ()))),
+                    lambda: self._request("DELETE", _MEMORY_PATH, body=body),
+                )
+            else:
+                data = self._request("DELETE", _MEMORY_PATH, body=body)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(namespace)
+        # A 204 No Content reply carries no count
+        return DeleteMemoryResponse(deleted=data.get("deleted", 0))
 
     def recall_with_llm(
         self,
@@ -321,6 +1001,8 @@ class TinyHumanMemoryClient:
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         url: Optional[str] = None,
+        cache_context: bool = False,
+        cache_response: bool = False,
     ) -> LLMQueryResponse:
         """Optional: run a prompt through a supported LLM with optional context.
 
@@ -349,6 +1031,11 @@ class TinyHumanMemoryClient:
             url: Optional custom API endpoint URL. If provided, uses OpenAI-compatible format
                 (POST with JSON body: {"model": ..., "messages": [{"role": "system/user", "content": ...}]}).
                 Response expected: {"choices": [{"message": {"content": "..."}}]}.
+            cache_context: Ask Anthropic to cache the context as a prompt prefix
+                (``cache_control``), so repeated calls with the same context are
+                cheaper and faster. Only worth enabling when the context is reused.
+            cache_response: Reuse the reply of an identical earlier request instead of
+                calling the provider again. Only applies when ``temperature`` is 0.
 
         Returns:
             LLMQueryResponse with the model reply text.
@@ -357,18 +1044,9 @@ class TinyHumanMemoryClient:
             ValueError: If context is not provided and namespace is not provided; or provider/api_key invalid.
             TinyHumanError: On provider API errors.
         """
-        if not context.strip():
-            if not namespace:
-                raise ValueError(
-                    "When context is not provided, pass namespace (and optionally num_chunks) "
-                    "so context can be fetched from memory via recall_memory."
-                )
-            ctx = self.recall_memory(
-                namespace=namespace,
-                prompt=prompt,
-                num_chunks=num_chunks,
-            )
-            context = ctx.context
+        context = self._llm_context(
+            prompt=prompt, context=context, namespace=namespace, num_chunks=num_chunks
+        )
         return _query_llm_func(
             prompt=prompt,
             provider=provider,
@@ -378,30 +1056,204 @@ class TinyHumanMemoryClient:
             max_tokens=max_tokens,
             temperature=temperature,
             url=url,
+            cache_context=cache_context,
+            cache_response=cache_response,
+        )
+
+    def recall_with_llm_stream(
+        self,
+        *,
+        prompt: str,
+        provider: str = "openai",
+        model: str = "gpt-4o-mini",
+        api_key: str,
+        context: str = "",
+        namespace: Optional[str] = None,
+        num_chunks: int = 10,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        url: Optional[str] = None,
+        cache_context: bool = False,
+    ) -> Iterator[str]:
+        """Like `recall_with_llm`, but yields the reply text as it is generated.
+
+        The provider streams its reply as server-sent events and each chunk of
+        text is yielded as soon as it arrives. Context is fetched (when needed)
+        and arguments are validated before this method returns.
+
+        Args:
+            prompt: User prompt to send.
+            provider: Provider name, as for `recall_with_llm`.
+            model: Model name.
+            api_key: Provider API key (not the TinyHumans token).
+            context: Optional context string; fetched via recall_memory when empty.
+            namespace: Optional namespace used to fetch context.
+            num_chunks: Number of chunks to fetch when context is auto-fetched.
+            max_tokens: Optional max tokens to generate.
+            temperature: Optional sampling temperature.
+            url: Optional OpenAI-compatible endpoint URL for custom providers.
+            cache_context: Ask Anthropic to cache the context as a prompt prefix.
+
+        Returns:
+            An iterator of reply text chunks. Joined, they form the full reply.
+
+        Raises:
+            ValueError: If context is not provided and namespace is not provided; or provider/api_key invalid.
+            TinyHumanError: On API errors; provider errors are raised while iterating.
+        """
+        context = self._llm_context(
+            prompt=prompt, context=context, namespace=namespace, num_chunks=num_chunks
+        )
+        return _stream_llm_func(
+            prompt=prompt,
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            context=context,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            url=url,
+            cache_context=cache_context,
         )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _get(self, path: str, params: list[tuple[str, str]]) -> dict[str, Any]:
-        response = self._http.get(path, params=params)
-        return self._parse_response(response)
-
-    def _send(self, method: str, path: str, body: dict[str, Any]) -> dict[str, Any]:
-        response = self._http.request(method, path, json=body)
-        return self._parse_response(response)
+    def _llm_context(
+        self, *, prompt: str, context: str, namespace: Optional[str], num_chunks: int
+    ) -> str:
+        """Return ``context``, or fetch it from memory when it is empty."""
+        if context.strip():
+            return context
+        if not namespace:
+            raise ValueError(
+                "When context is not provided, pass namespace (and optionally num_chunks) "
+                "so context can be fetched from memory via recall_memory."
+            )
+        ctx = self.recall_memory(
+            namespace=namespace,
+            prompt=prompt,
+            num_chunks=num_chunks,
+        )
+        return ctx.context
 
-    def _parse_response(self, response: httpx.Response) -> dict[str, Any]:
+    def _ingest_wire(
+        self, normalized: list[dict[str, Any]], idempotency_key: Optional[str] = None
+    ) -> IngestMemoryResponse:
+        """POST already-normalized items and drop their namespaces from the cache."""
+        body = {"items": normalized}
         try:
-            payload = response.json()
-        except Exception:
-            raise TinyHumanError(
-                f"HTTP {response.status_code}: non-JSON response",
-                response.status_code,
-                response.text,
+            data = self._request(
+                "POST", _MEMORY_PATH, body=body, idempotency_key=idempotency_key
             )
-        if not response.is_success:
-            message = payload.get("error", f"HTTP {response.status_code}")
-            raise TinyHumanError(message, response.status_code, payload)
-        return payload["data"]
+        finally:
+            self._invalidate_ingested(normalized)
+        return _ingest_response(data)
+
+    def _ensure_open(self) -> None:
+        # The shared pool outlives the client, so httpx would not notice
+        if self._closed:
+            raise RuntimeError("Cannot send a request, as the client has been closed.")
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Sequence[tuple[str, str]]] = None,
+        body: Optional[dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> dict[str, Any]:
+        self._ensure_open()
+        if body is None:
+            url, query = self._query_url(path, params)
+            if self._coalesce and method == "GET":
+                return self._coalesced(
+                    (method, path, query),
+                    lambda: _parse_response(
+                        self._request_with_retry(method, url, retry=True)
+                    ),
+                )
+            response = self._request_with_retry(method, url, retry=True)
+            return _parse_response(response)
+
+        url = self._url(path)
+        content = _json_dumps(body)
+        # POST is only safe to replay when the server can deduplicate it
+        retry = method != "POST" or idempotency_key is not None
+        headers, gzip_headers = _body_headers(idempotency_key)
+        threshold = self._compress_threshold
+        if threshold is not None and len(content) >= threshold:
+            response = self._request_with_retry(
+                method,
+                url,
+                retry=retry,
+                content=gzip.compress(content, compresslevel=_GZIP_LEVEL),
+                headers=gzip_headers,
+            )
+            if response.status_code != 415:
+                return _parse_response(response)
+            # Server does not accept compressed bodies; stop compressing.
+            self._compress_threshold = None
+        response = self._request_with_retry(
+            method,
+            url,
+            retry=retry,
+            content=content,
+            headers=headers,
+        )
+        return _parse_response(response)
+
+    def _request_with_retry(
+        self, method: str, url: httpx.URL, *, retry: bool, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures when ``retry`` is set.
+
+        Retries timeouts, dropped connections and 429/5xx responses. Connect
+        failures are not retried here; the transport already did.
+        """
+        attempt = 0
+        while True:
+            can_retry = retry and attempt < self._max_retries
+            try:
+                response = self._request_raw(method, url, **kwargs)
+            except _CONNECT_ERRORS:
+                raise
+            except _TRANSIENT_ERRORS:
+                if not can_retry:
+                    raise
+                delay = _retry_delay(attempt)
+            else:
+                if not can_retry or response.status_code not in _RETRY_STATUSES:
+                    return response
+                delay = _retry_delay(attempt, response)
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _coalesced(
+        self, key: tuple[Any, ...], fetch: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Run ``fetch`` once for all concurrent callers sharing ``key``."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            # Each waiter gets its own copy so callers cannot see each other's
+            # changes to nested values such as metadata
+            return copy.deepcopy(future.result())
+        try:
+            result = fetch()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
@@ -1,12 +1,120 @@
 """Optional LLM query functionality for third-party providers."""
 
 from __future__ import annotations
+from ._http2 import http2_available as _http2_available
+from ._json import dumps as _json_dumps, loads as _json_loads
+from ._retry import RETRY_STATUSES as _RETRY_STATUSES, retry_delay as _retry_delay
 from .types import LLMQueryResponse, TinyHumanError
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+import asyncio
+import atexit
+import hashlib
+import threading
+import time
 import httpx
 
 SUPPORTED_LLM_PROVIDERS = ("openai", "anthropic", "google")
 
+_LLM_TIMEOUT = 60
+# Retries after a 429/5xx from the provider, on top of the first attempt
+_LLM_MAX_RETRIES = 3
+# Waits between retries, including ones asked for by Retry-After, stay near
+# 0.5s * 2**attempt so a rate-limited call gives up within a few seconds
+_LLM_RETRY_BASE_DELAY = 0.5
+_WARMUP_TIMEOUT = 5.0
+
+_OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+_ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
+_ANTHROPIC_VERSION = "2023-06-01"
+_GOOGLE_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:{method}"
+_GOOGLE_GENERATE = "generateContent"
+# The streaming endpoint sends each chunk as a server-sent event
+_GOOGLE_STREAM = "streamGenerateContent?alt=sse"
+
+# Origins contacted by `warmup_llm_connections` for each built-in provider
+_PROVIDER_ORIGINS = {
+    "openai": "https://api.openai.com/",
+    "anthropic": "https://api.anthropic.com/",
+    "google": "https://generativelanguage.googleapis.com/",
+}
+_LLM_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+# Most recent replies kept by ``cache_response``
+_RESPONSE_CACHE_MAX = 512
+_response_cache: OrderedDict[bytes, str] = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Return the process-wide client for provider requests, created on first use.
+
+    Reusing one pooled client keeps TLS connections to each provider alive
+    between calls instead of opening a new one per request. With the ``h2``
+    package installed, concurrent requests to a provider are multiplexed over
+    one HTTP/2 connection.
+    """
+    global _client
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=_LLM_TIMEOUT,
+                    limits=_LLM_LIMITS,
+                    http2=_http2_available(),
+                )
+            client = _client
+    return client
+
+
+def _new_async_client() -> httpx.AsyncClient:
+    """Create a pooled async client for provider requests.
+
+    Async pools are bound to the event loop that opened them, so there is no
+    process-wide async client; `AsyncTinyHumanMemoryClient` owns one and closes
+    it in ``aclose()``.
+    """
+    return httpx.AsyncClient(
+        timeout=_LLM_TIMEOUT, limits=_LLM_LIMITS, http2=_http2_available()
+    )
+
+
+class _LLMRequest(NamedTuple):
+    """A provider request and how to read the reply text from its response."""
+
+    url: str
+    headers: dict[str, str]
+    body: dict[str, Any]
+    provider: str
+    reply: Callable[[Any], str]
+    # Text carried by one streamed event, if any
+    delta: Callable[[Any], Optional[str]]
+
+
+@atexit.register
+def _close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
 
 def recall_with_llm(
     *,
@@ -18,6 +126,8 @@ def recall_with_llm(
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
     url: Optional[str] = None,
+    cache_context: bool = False,
+    cache_response: bool = False,
 ) -> LLMQueryResponse:
     """Optional: run a prompt through a supported LLM with optional context.
 
@@ -39,6 +149,15 @@ def recall_with_llm(
         url: Optional custom API endpoint URL. If provided, uses OpenAI-compatible format
             (POST with JSON body: {"model": ..., "messages": [{"role": "system/user", "content": ...}]}).
             Response expected: {"choices": [{"message": {"content": "..."}}]}.
+        cache_context: Ask Anthropic to cache the context as a prompt prefix, so
+            later calls with the same context are cheaper and faster. Cache writes
+            are billed above normal input tokens, so only enable it when the
+            context is reused. OpenAI and Gemini cache repeated prefixes
+            automatically; ignored for custom providers.
+        cache_response: Serve repeated identical requests from an in-process
+            cache of the last 512 replies instead of calling the provider again.
+            Only applies when ``temperature`` is 0, since other settings do not
+            give repeatable output.
 
     Returns:
         LLMQueryResponse with the model reply text.
@@ -47,87 +166,392 @@ def recall_with_llm(
         ValueError: If provider is unsupported (when url not provided) or api_key missing.
         TinyHumanError: On provider API errors.
     """
+    request = _build_llm_request(
+        prompt=prompt,
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        context=context,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        url=url,
+        cache_context=cache_context,
+    )
+    content = _json_dumps(request.body)
+    cache_key = None
+    if cache_response and temperature == 0:
+        cache_key = _response_cache_key(request, content)
+        cached = _cached_reply(cache_key)
+        if cached is not None:
+            return LLMQueryResponse(text=cached)
+    return _llm_response(_post(request, content), request, cache_key)
+
+
+def warmup_llm_connections(
+    providers: Iterable[str] = SUPPORTED_LLM_PROVIDERS,
+) -> None:
+    """Open pooled connections to LLM providers ahead of the first request.
+
+    Sends a cheap ``HEAD`` request to each provider so the TCP/TLS handshake
+    happens at startup instead of on the first `recall_with_llm` call. Any
+    response status counts as success, and network errors are ignored; the
+    real request simply connects as usual.
+
+    Args:
+        providers: Built-in provider names to connect to (default: all).
+
+    Raises:
+        ValueError: If a provider name is not supported.
+    """
+    http = _get_client()
+    for origin in _warmup_origins(providers):
+        try:
+            http.head(origin, timeout=_WARMUP_TIMEOUT)
+        except httpx.HTTPError:
+            pass
+
+
+async def awarmup_llm_connections(
+    http_client: httpx.AsyncClient,
+    providers: Iterable[str] = SUPPORTED_LLM_PROVIDERS,
+) -> None:
+    """Async version of `warmup_llm_connections` for the pool of ``http_client``.
+
+    Contacts all providers concurrently.
+    """
+    await asyncio.gather(
+        *(
+            http_client.head(origin, timeout=_WARMUP_TIMEOUT)
+            for origin in _warmup_origins(providers)
+        ),
+        return_exceptions=True,
+    )
+
+
+def _warmup_origins(providers: Iterable[str]) -> list[str]:
+    origins = []
+    for provider in providers:
+        origin = _PROVIDER_ORIGINS.get(provider.strip().lower())
+        if origin is None:
+            raise ValueError(
+                f"provider must be one of {SUPPORTED_LLM_PROVIDERS}, got {provider!r}"
+            )
+        origins.append(origin)
+    return origins
+
+
+async def arecall_with_llm(
+    *,
+    prompt: str,
+    provider: str,
+    model: str,
+    api_key: str,
+    context: str = "",
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    url: Optional[str] = None,
+    cache_context: bool = False,
+    cache_response: bool = False,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> LLMQueryResponse:
+    """Async version of `recall_with_llm`.
+
+    Takes the same arguments and raises the same errors as `recall_with_llm`.
+    Pass a pooled ``http_client`` to reuse connections across calls, so many
+    prompts can be sent concurrently with ``asyncio.gather``; the caller owns
+    and closes it. Without one, a client is opened and closed for this call.
+    """
+    request = _build_llm_request(
+        prompt=prompt,
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        context=context,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        url=url,
+        cache_context=cache_context,
+    )
+    content = _json_dumps(request.body)
+    cache_key = None
+    if cache_response and temperature == 0:
+        cache_key = _response_cache_key(request, content)
+        cached = _cached_reply(cache_key)
+        if cached is not None:
+            return LLMQueryResponse(text=cached)
+    if http_client is not None:
+        response = await _apost(http_client, request, content)
+    else:
+        async with _new_async_client() as http:
+            response = await _apost(http, request, content)
+    return _llm_response(response, request, cache_key)
+
+
+def recall_with_llm_stream(
+    *,
+    prompt: str,
+    provider: str,
+    model: str,
+    api_key: str,
+    context: str = "",
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    url: Optional[str] = None,
+    cache_context: bool = False,
+) -> Iterator[str]:
+    """Streaming version of `recall_with_llm` that yields the reply as it is generated.
+
+    The provider is asked to stream its reply as server-sent events, and each
+    chunk of text is yielded as soon as it arrives, so callers can show or
+    process output before generation finishes. Takes the same arguments as
+    `recall_with_llm` (except ``cache_response``); arguments are validated when
+    this function is called, before iteration starts.
+
+    Returns:
+        An iterator of reply text chunks. Joined, they form the full reply.
+
+    Raises:
+        ValueError: If provider is unsupported (when url not provided) or api_key missing.
+        TinyHumanError: On provider API errors, raised while iterating.
+    """
+    request = _build_llm_request(
+        prompt=prompt,
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        context=context,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        url=url,
+        cache_context=cache_context,
+        stream=True,
+    )
+    return _stream_reply(request)
+
+
+def arecall_with_llm_stream(
+    *,
+    prompt: str,
+    provider: str,
+    model: str,
+    api_key: str,
+    context: str = "",
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    url: Optional[str] = None,
+    cache_context: bool = False,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[str]:
+    """Async version of `recall_with_llm_stream`; iterate it with ``async for``.
+
+    ``http_client`` is used as in `arecall_with_llm`.
+    """
+    request = _build_llm_request(
+        prompt=prompt,
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        context=context,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        url=url,
+        cache_context=cache_context,
+        stream=True,
+    )
+    return _astream_reply(request, http_client)
+
+
+def _llm_retry_delay(attempt: int, response: httpx.Response) -> float:
+    return _retry_delay(attempt, response, _LLM_RETRY_BASE_DELAY * 2**attempt)
+
+
+def _post(request: _LLMRequest, content: bytes) -> httpx.Response:
+    """POST a provider request, retrying rate-limit and server errors.
+
+    The last response is returned as-is once retries run out.
+    """
+    http = _get_client()
+    for attempt in range(_LLM_MAX_RETRIES):
+        r = http.post(request.url, headers=request.headers, content=content)
+        if r.status_code not in _RETRY_STATUSES:
+            return r
+        time.sleep(_llm_retry_delay(attempt, r))
+    return http.post(request.url, headers=request.headers, content=content)
+
+
+async def _apost(
+    http: httpx.AsyncClient, request: _LLMRequest, content: bytes
+) -> httpx.Response:
+    """Async version of `_post`, sent through ``http``."""
+    for attempt in range(_LLM_MAX_RETRIES):
+        r = await http.post(request.url, headers=request.headers, content=content)
+        if r.status_code not in _RETRY_STATUSES:
+            return r
+        await asyncio.sleep(_llm_retry_delay(attempt, r))
+    return await http.post(request.url, headers=request.headers, content=content)
+
+
+def _stream_reply(request: _LLMRequest) -> Iterator[str]:
+    content = _json_dumps(request.body)
+    http = _get_client()
+    for attempt in range(_LLM_MAX_RETRIES + 1):
+        with http.stream(
+            "POST", request.url, headers=request.headers, content=content
+        ) as r:
+            if r.status_code in _RETRY_STATUSES and attempt < _LLM_MAX_RETRIES:
+                delay = _llm_retry_delay(attempt, r)
+            else:
+                if not r.is_success:
+                    r.read()
+                    _raise_llm_error(r, request.provider)
+                for line in r.iter_lines():
+                    text = _stream_text(request, line, r.status_code)
+                    if text is None:
+                        break
+                    if text:
+                        yield text
+                return
+        time.sleep(delay)
+
+
+async def _astream_reply(
+    request: _LLMRequest, http_client: Optional[httpx.AsyncClient]
+) -> AsyncIterator[str]:
+    if http_client is not None:
+        async for text in _astream_from(http_client, request):
+            yield text
+    else:
+        async with _new_async_client() as http:
+            async for text in _astream_from(http, request):
+                yield text
+
+
+async def _astream_from(
+    http: httpx.AsyncClient, request: _LLMRequest
+) -> AsyncIterator[str]:
+    content = _json_dumps(request.body)
+    for attempt in range(_LLM_MAX_RETRIES + 1):
+        async with http.stream(
+            "POST", request.url, headers=request.headers, content=content
+        ) as r:
+            if r.status_code in _RETRY_STATUSES and attempt < _LLM_MAX_RETRIES:
+                delay = _llm_retry_delay(attempt, r)
+            else:
+                if not r.is_success:
+                    await r.aread()
+                    _raise_llm_error(r, request.provider)
+                async for line in r.aiter_lines():
+                    text = _stream_text(request, line, r.status_code)
+                    if text is None:
+                        break
+                    if text:
+                        yield text
+                return
+        await asyncio.sleep(delay)
+
+
+def _stream_text(request: _LLMRequest, line: str, status: int) -> Optional[str]:
+    """Return the reply text in one server-sent event line.
+
+    Returns an empty string for lines without text (comments, event names,
+    metadata events) and None at the OpenAI-style ``[DONE]`` marker.
+
+    Raises:
+        TinyHumanError: If the provider reports an error mid-stream.
+    """
+    if not line.startswith("data:"):
+        return ""
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return None
+    event = _json_loads(data)
+    if "error" in event:
+        err = event["error"]
+        msg = err.get("message", err) if isinstance(err, dict) else err
+        raise TinyHumanError(f"{request.provider} API error: {msg}", status, event)
+    return request.delta(event) or ""
+
+
+def _llm_response(
+    response: httpx.Response, request: _LLMRequest, cache_key: Optional[bytes] = None
+) -> LLMQueryResponse:
+    _raise_llm_error(response, request.provider)
+    text = request.reply(_json_loads(response.content))
+    if cache_key is not None:
+        with _response_cache_lock:
+            _response_cache[cache_key] = text
+            _response_cache.move_to_end(cache_key)
+            while len(_response_cache) > _RESPONSE_CACHE_MAX:
+                _response_cache.popitem(last=False)
+    return LLMQueryResponse(text=text)
+
+
+def _response_cache_key(request: _LLMRequest, content: bytes) -> bytes:
+    """Hash everything sent to the provider, including the API key."""
+    digest = hashlib.sha256(_json_dumps([request.url, request.headers]))
+    digest.update(content)
+    return digest.digest()
+
+
+def _cached_reply(cache_key: bytes) -> Optional[str]:
+    with _response_cache_lock:
+        text = _response_cache.get(cache_key)
+        if text is not None:
+            _response_cache.move_to_end(cache_key)
+        return text
+
+
+def _build_llm_request(
+    *,
+    prompt: str,
+    provider: str,
+    model: str,
+    api_key: str,
+    context: str,
+    max_tokens: Optional[int],
+    temperature: Optional[float],
+    url: Optional[str],
+    cache_context: bool,
+    stream: bool = False,
+) -> _LLMRequest:
     if not api_key or not api_key.strip():
         raise ValueError("api_key is required for recall_with_llm")
     api_key = api_key.strip()
 
     if url:
         # Custom provider: use OpenAI-compatible format
-        text = _query_custom(
-            url=url,
+        return _chat_completions_request(
+            url,
+            "Custom provider",
             prompt=prompt,
             model=model,
             api_key=api_key,
             context=context,
             max_tokens=max_tokens,
             temperature=temperature,
+            stream=stream,
         )
-    else:
-        # Built-in provider
-        provider = provider.strip().lower()
-        if provider not in SUPPORTED_LLM_PROVIDERS:
-            raise ValueError(
-                f"provider must be one of {SUPPORTED_LLM_PROVIDERS}, got {provider!r}. "
-                "For custom providers, pass the 'url' parameter."
-            )
-        text = _query_llm(
-            prompt=prompt,
-            provider=provider,
-            model=model,
-            api_key=api_key,
-            context=context,
-            max_tokens=max_tokens,
-            temperature=temperature,
+    # Built-in provider
+    provider = provider.strip().lower()
+    build = _PROVIDER_REQUESTS.get(provider)
+    if build is None:
+        raise ValueError(
+            f"provider must be one of {SUPPORTED_LLM_PROVIDERS}, got {provider!r}. "
+            "For custom providers, pass the 'url' parameter."
         )
-    return LLMQueryResponse(text=text)
-
-
-def _query_llm(
-    *,
-    prompt: str,
-    provider: str,
-    model: str,
-    api_key: str,
-    context: str = "",
-    max_tokens: Optional[int] = None,
-    temperature: Optional[float] = None,
-) -> str:
-    with httpx.Client(timeout=60) as http:
-        if provider == "openai":
-            return _query_openai(
-                http,
-                prompt=prompt,
-                model=model,
-                api_key=api_key,
-                context=context,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-        if provider == "anthropic":
-            return _query_anthropic(
-                http,
-                prompt=prompt,
-                model=model,
-                api_key=api_key,
-                context=context,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-        if provider == "google":
-            return _query_google(
-                http,
-                prompt=prompt,
-                model=model,
-                api_key=api_key,
-                context=context,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-    raise ValueError(f"Unsupported provider: {provider}")
+    return build(
+        prompt=prompt,
+        model=model,
+        api_key=api_key,
+        context=context,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        cache_context=cache_context,
+        stream=stream,
+    )
 
 
-def _query_openai(
-    http: httpx.Client,
+def _openai_request(
     *,
     prompt: str,
     model: str,
@@ -135,31 +559,25 @@ def _query_openai(
     context: str = "",
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
-) -> str:
-    messages: list[dict[str, str]] = []
-    if context:
-        messages.append({"role": "system", "content": context})
-    messages.append({"role": "user", "content": prompt})
-    body: dict[str, Any] = {"model": model, "messages": messages}
-    if max_tokens is not None:
-        body["max_tokens"] = max_tokens
-    if temperature is not None:
-        body["temperature"] = temperature
-    r = http.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json=body,
+    cache_context: bool = False,
+    stream: bool = False,
+) -> _LLMRequest:
+    # Repeated prompt prefixes are cached by the provider automatically, and
+    # the context already comes first, so cache_context needs no request change
+    return _chat_completions_request(
+        _OPENAI_URL,
+        "OpenAI",
+        prompt=prompt,
+        model=model,
+        api_key=api_key,
+        context=context,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=stream,
     )
-    _raise_llm_error(r, "OpenAI")
-    data = r.json()
-    return data["choices"][0]["message"]["content"]
 
 
-def _query_anthropic(
-    http: httpx.Client,
+def _anthropic_request(
     *,
     prompt: str,
     model: str,
@@ -167,32 +585,51 @@ def _query_anthropic(
     context: str = "",
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
-) -> str:
+    cache_context: bool = False,
+    stream: bool = False,
+) -> _LLMRequest:
     body: dict[str, Any] = {
         "model": model,
         "max_tokens": max_tokens if max_tokens is not None else 1024,
         "messages": [{"role": "user", "content": prompt}],
     }
-    if context:
+    if context and cache_context:
+        # Mark the context as a cacheable prefix so repeated calls with the
+        # same context reuse it on the provider side
+        body["system"] = [
+            {"type": "text", "text": context, "cache_control": {"type": "ephemeral"}}
+        ]
+    elif context:
         body["system"] = context
     if temperature is not None:
         body["temperature"] = temperature
-    r = http.post(
-        "https://api.anthropic.com/v1/messages",
+    if stream:
+        body["stream"] = True
+    return _LLMRequest(
+        url=_ANTHROPIC_URL,
         headers={
             "x-api-key": api_key,
-            "anthropic-version": "2023-06-01",
+            "anthropic-version": _ANTHROPIC_VERSION,
             "Content-Type": "application/json",
         },
-        json=body,
+        body=body,
+        provider="Anthropic",
+        reply=_anthropic_reply,
+        delta=_anthropic_delta,
     )
-    _raise_llm_error(r, "Anthropic")
-    data = r.json()
+
+
+def _anthropic_reply(data: Any) -> str:
     return data["content"][0]["text"]
 
 
-def _query_google(
-    http: httpx.Client,
+def _anthropic_delta(event: Any) -> Optional[str]:
+    if event.get("type") != "content_block_delta":
+        return None
+    return event["delta"].get("text")
+
+
+def _google_request(
     *,
     prompt: str,
     model: str,
@@ -200,7 +637,11 @@ def _query_google(
     context: str = "",
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
-) -> str:
+    cache_context: bool = False,
+    stream: bool = False,
+) -> _LLMRequest:
+    # Repeated prompt prefixes are cached by the provider automatically, and
+    # the context already comes first, so cache_context needs no request change
     parts: list[dict[str, str]] = [{"text": prompt}]
     if context:
         parts = [{"text": f"Context:\n{context}\n\nUser: {prompt}"}]
@@ -211,57 +652,91 @@ def _query_google(
             body["generationConfig"]["maxOutputTokens"] = max_tokens
         if temperature is not None:
             body["generationConfig"]["temperature"] = temperature
-    r = http.post(
-        f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}",
-        headers={"Content-Type": "application/json"},
-        json=body,
+    return _LLMRequest(
+        url=_GOOGLE_URL.format(
+            model=model, method=_GOOGLE_STREAM if stream else _GOOGLE_GENERATE
+        ),
+        # Sent as a header rather than a query parameter so the key stays
+        # out of URLs (and any logs that record them)
+        headers={"x-goog-api-key": api_key, "Content-Type": "application/json"},
+        body=body,
+        provider="Google",
+        reply=_google_reply,
+        delta=_google_delta,
     )
-    _raise_llm_error(r, "Google")
-    data = r.json()
+
+
+def _google_reply(data: Any) -> str:
     return data["candidates"][0]["content"]["parts"][0]["text"]
 
 
-def _query_custom(
-    *,
+def _google_delta(event: Any) -> Optional[str]:
+    candidates = event.get("candidates")
+    if not candidates:
+        return None
+    parts = candidates[0].get("content", {}).get("parts", ())
+    return "".join(part.get("text", "") for part in parts)
+
+
+def _chat_completions_request(
     url: str,
+    provider: str,
+    *,
     prompt: str,
     model: str,
     api_key: str,
     context: str = "",
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
-) -> str:
-    """Query a custom provider using OpenAI-compatible format."""
-    messages: list[dict[str, str]] = []
-    if context:
-        messages.append({"role": "system", "content": context})
-    messages.append({"role": "user", "content": prompt})
+    stream: bool = False,
+) -> _LLMRequest:
+    """Build an OpenAI-compatible chat completions request."""
+    user = {"role": "user", "content": prompt}
+    messages = [{"role": "system", "content": context}, user] if context else [user]
     body: dict[str, Any] = {"model": model, "messages": messages}
     if max_tokens is not None:
         body["max_tokens"] = max_tokens
     if temperature is not None:
         body["temperature"] = temperature
+    if stream:
+        body["stream"] = True
+    return _LLMRequest(
+        url=url,
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        body=body,
+        provider=provider,
+        reply=_chat_completions_reply,
+        delta=_chat_completions_delta,
+    )
 
-    with httpx.Client(timeout=60) as http:
-        r = http.post(
-            url,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            json=body,
-        )
-        _raise_llm_error(r, "Custom provider")
-        data = r.json()
-        # OpenAI-compatible response format
-        return data["choices"][0]["message"]["content"]
+
+def _chat_completions_reply(data: Any) -> str:
+    return data["choices"][0]["message"]["content"]
+
+
+def _chat_completions_delta(event: Any) -> Optional[str]:
+    choices = event.get("choices")
+    if not choices:
+        return None
+    return choices[0].get("delta", {}).get("content")
+
+
+# Request builders for the built-in providers, keyed by provider name
+_PROVIDER_REQUESTS: dict[str, Callable[..., _LLMRequest]] = {
+    "openai": _openai_request,
+    "anthropic": _anthropic_request,
+    "google": _google_request,
+}
 
 
 def _raise_llm_error(response: httpx.Response, provider: str) -> None:
     if response.is_success:
         return
     try:
-        payload = response.json()
+        payload = _json_loads(response.content)
         err = payload.get("error", {})
         msg = err.get("message", payload.get("message", response.text))
     except Exception:
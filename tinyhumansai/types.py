@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
@@ -11,6 +12,14 @@ DEFAULT_BASE_URL = "https://api.tinyhumans.ai"
 # Environment variable for base URL override (e.g. from .env)
 BASE_URL_ENV = "TINYHUMANS_BASE_URL"
 
+# ``slots=True`` drops the per-instance ``__dict__``; it needs Python 3.10+
+_SLOTS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Connection pool defaults, sized for concurrent ingest/recall fan-out
+DEFAULT_MAX_CONNECTIONS = 1000
+DEFAULT_MAX_KEEPALIVE = 100
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
 
 @dataclass
 class TinyHumanConfig:
@@ -26,7 +35,7 @@ class TinyHumanConfig:
     """Base URL of the backend. If None, uses TINYHUMANS_BASE_URL env var or default URL."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MemoryItem:
     """A single memory item to ingest."""
 
@@ -49,7 +58,7 @@ class MemoryItem:
     """Optional Unix timestamp (seconds) for when this memory was last updated."""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class IngestMemoryResponse:
     """Response from memory ingestion."""
 
@@ -58,7 +67,7 @@ class IngestMemoryResponse:
     errors: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReadMemoryItem:
     """A single memory item returned from a read."""
 
@@ -70,7 +79,7 @@ class ReadMemoryItem:
     updated_at: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GetContextResponse:
     """Response containing an LLM-friendly context string and the source items."""
 
@@ -79,7 +88,7 @@ class GetContextResponse:
     count: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DeleteMemoryResponse:
     """Response from memory deletion."""
 
@@ -100,7 +109,7 @@ class TinyHumanError(Exception):
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class LLMQueryResponse:
     """Response from recall_with_llm (optional LLM provider integration)."""
 